@@ -1,20 +1,132 @@
-import json, logging
+import logging, atexit, functools, os, threading
+import concurrent.futures
+import orjson
 from config import *
+import config
 
+# In-memory cache of every tile JSON file touched this run, keyed by path.
+# Writes go to the cache plus an append-only <path>.jsonl log, so saving a
+# tile is O(1) instead of a full load/dump of the whole dict. The
+# consolidated .json is written once per flush.
+_file_cache: dict[str, dict] = {}
+_log_handles: dict = {}
+
+
+def LoadTileJSON(output_file):
+    """Return the in-memory dict for a tile JSON file, loading the .json and
+    replaying any .jsonl log (crash recovery) on first access."""
+    keys = _file_cache.get(output_file)
+    if keys is not None:
+        return keys
 
-def SaveTileToJSON(x, y, z, value, output_file):
     try:
-        with open(output_file, "r") as f:
-            keys = json.load(f)
+        with open(output_file, "rb", buffering=1 << 20) as f:
+            keys = orjson.loads(f.read())
     except FileNotFoundError:
         keys = {}
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         keys = {}
 
-    keys[f"{x}_{y}_{z}"] = value
+    try:
+        with open(output_file + ".jsonl", "rb", buffering=1 << 20) as f:
+            for line in f:
+                if line.strip():
+                    keys.update(orjson.loads(line))
+    except FileNotFoundError:
+        pass
+
+    _file_cache[output_file] = keys
+    return keys
+
+
+def _GetTileLogHandle(output_file):
+    handle = _log_handles.get(output_file)
+    if handle is None:
+        handle = open(output_file + ".jsonl", "ab", buffering=1 << 16)
+        _log_handles[output_file] = handle
+    return handle
+
+
+def FlushTileJSON(output_file):
+    """Write the consolidated .json for a path and truncate its .jsonl log."""
+    if output_file not in _file_cache:
+        return
+
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps(_file_cache[output_file]))
+
+    handle = _log_handles.pop(output_file, None)
+    if handle is not None:
+        handle.close()
+    open(output_file + ".jsonl", "wb").close()
+
+
+def FlushAllTileJSON():
+    for output_file in list(_file_cache):
+        FlushTileJSON(output_file)
+
+
+atexit.register(FlushAllTileJSON)
+
+
+def DeleteTilesFromJSON(keys, output_file):
+    """Remove a batch of tile keys from a tile JSON file and flush it once."""
+    cached = LoadTileJSON(output_file)
+    dropped = set(keys)
+    # Rebuild in one pass rather than hash-deleting key by key
+    _file_cache[output_file] = {k: v for k, v in cached.items() if k not in dropped}
+    FlushTileJSON(output_file)
+
+
+def SaveTileToJSON(x, y, z, value, output_file):
+    SaveTilesToJSON([(x, y, z, value)], output_file)
+
+
+def SaveTilesToJSON(rows, output_file):
+    """Apply a batch of (x, y, z, value) rows to a tile JSON file."""
+    if not rows:
+        return
+
+    # Resolve the cache dict and log handle once per batch, not per row
+    keys = LoadTileJSON(output_file)
+    handle = _GetTileLogHandle(output_file)
+
+    lines = []
+    for x, y, z, value in rows:
+        key = f"{x}_{y}_{z}"
+        keys[key] = value
+        lines.append(orjson.dumps({key: value}))
+
+    handle.write(b"\n".join(lines) + b"\n")
+
+
+class _TileWriteBuffer:
+    """Buffers tile writes so each output file is rewritten once per flush
+    instead of once per tile."""
 
-    with open(output_file, "w") as f:
-        json.dump(keys, f, indent=4)
+    def __init__(self) -> None:
+        self.pending: dict[str, list] = {}
+        self.lock = threading.Lock()
+
+    def Save(self, x, y, z, value, output_file):
+        with self.lock:
+            self.pending.setdefault(output_file, []).append((x, y, z, value))
+
+    def Flush(self):
+        with self.lock:
+            pending = self.pending
+            self.pending = {}
+
+        for output_file, rows in pending.items():
+            SaveTilesToJSON(rows, output_file)
+
+
+@functools.lru_cache(maxsize=8192)
+def _CachedGetOperation(op_id):
+    # An operation's asset ID never changes once resolved, so duplicated
+    # retries (e.g. re-fetching after a failed save) can skip the HTTPS
+    # round trip. Failures aren't cached, so retries still hit the API.
+    return config.ROBLOX.GetOperation(op_id)
 
 
 class TileReprocessingError(Exception):
@@ -32,65 +144,90 @@ class AssetHandler:
         self.op_id_path = op_id_path
         self.missed_tiles_path = missed_tiles_path
         self.upload_func = upload_func
+        self.write_buffer = _TileWriteBuffer()
+        # Last error saved per tile key, so a tile stuck on the same error
+        # doesn't rewrite an identical missed-tiles row every retry
+        self.last_errors: dict[str, str] = {}
+        # Tile work is I/O-bound (HTTPS round trips), so fan it out over a
+        # bounded pool sized to the API's concurrency budget
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=int(os.getenv("TILE_POOL", "15"))
+        )
+        # Registered after the module-level FlushAllTileJSON, so on exit the
+        # buffer drains into the store before the store is consolidated
+        atexit.register(self.FlushWrites)
+
+    def FlushWrites(self):
+        self.write_buffer.Flush()
 
     def UploadTile(self, x, y, z):
+        key = f"{x}_{y}_{z}"
         try:
             op_id = self.upload_func(x, y, z)
-            SaveTileToJSON(x, y, z, op_id, self.op_id_path)
-            logging.info(f"Sucessfully uploaded Tile: {x}_{y}_{z}.")
+            self.write_buffer.Save(x, y, z, op_id, self.op_id_path)
+            logging.info("Sucessfully uploaded Tile: %s.", key)
             return op_id
         except Exception as e:
             error = str(e)
-            SaveTileToJSON(x, y, z, error, self.missed_tiles_path)
-            logging.error(f"Failed to upload Tile: {x}_{y}_{z}. Error: {error}")
+            if self.last_errors.get(key) != error:
+                self.last_errors[key] = error
+                self.write_buffer.Save(x, y, z, error, self.missed_tiles_path)
+            logging.error("Failed to upload Tile: %s. Error: %s", key, error)
 
     def RetrieveAssetIdTile(self, x, y, z, op_id):
+        key = f"{x}_{y}_{z}"
         try:
-            asset_id = ROBLOX.GetOperation(op_id)
-            SaveTileToJSON(x, y, z, f"rbxassetid://{asset_id}", self.asset_id_path)
-            logging.info(f"Sucessfully retrieved Asset ID for Tile: {x}_{y}_{z}.")
+            asset_id = _CachedGetOperation(op_id)
+            self.write_buffer.Save(
+                x, y, z, f"rbxassetid://{asset_id}", self.asset_id_path
+            )
+            self.last_errors.pop(key, None)
+            logging.info("Sucessfully retrieved Asset ID for Tile: %s.", key)
         except Exception as e:
             error = str(e)
-            SaveTileToJSON(x, y, z, error, self.missed_tiles_path)
+            if self.last_errors.get(key) != error:
+                self.last_errors[key] = error
+                self.write_buffer.Save(x, y, z, error, self.missed_tiles_path)
             logging.error(
-                f"Failed to retrieve Asset ID for Tile: {x}_{y}_{z}. Error: {error}"
+                "Failed to retrieve Asset ID for Tile: %s. Error: %s", key, error
             )
 
             # pass the exception upwards
             raise e
 
     def RetrieveAllAssetIds(self):
-        try:
-            with open(self.op_id_path, "r") as f:
-                tile_ops = json.load(f)
-        except FileNotFoundError:
-            tile_ops = {}
-        except json.JSONDecodeError:
-            tile_ops = {}
+        # Make sure any buffered op IDs are visible before reading them back
+        self.FlushWrites()
 
-        try:
-            with open(self.asset_id_path, "r") as f:
-                asset_ids = json.load(f)
-        except FileNotFoundError:
-            asset_ids = {}
-        except json.JSONDecodeError:
-            asset_ids = {}
-
-        for tile, op_id in tile_ops.items():
-            if tile in asset_ids.keys():
-                continue
-
-            tile_parts = tile.split("_")
-            x = tile_parts[0]
-            y = tile_parts[1]
-            z = tile_parts[2]
-
-            try:
-                self.RetrieveAssetIdTile(x, y, z, op_id)
-            except:
-                ...
-                # no need to do anything
-                # feels wrong, refactor later
+        tile_ops = LoadTileJSON(self.op_id_path)
+        asset_ids = LoadTileJSON(self.asset_id_path)
+
+        # Snapshot the existing keys once so the loop does set lookups
+        # instead of probing a dict that workers may be mutating
+        existing = set(asset_ids)
+
+        # Collect every tile still needing an asset ID in one pass, then
+        # submit the whole batch
+        pending = [
+            (*map(int, tile.split("_")), op_id)
+            for tile, op_id in tile_ops.items()
+            if tile not in existing
+        ]
+
+        # Process in (z, x, y) order so neighbouring tiles land together in
+        # the output files instead of following dict insertion order
+        pending.sort(key=lambda row: (row[2], row[0], row[1]))
+
+        futures = []
+        for x, y, z, op_id in pending:
+            futures.append(self.pool.submit(self.RetrieveAssetIdTile, x, y, z, op_id))
+
+        # failures are already logged and saved to the missed tiles file by
+        # RetrieveAssetIdTile, so just wait for everything to settle
+        concurrent.futures.wait(futures)
+
+        self.FlushWrites()
+        FlushAllTileJSON()
 
     # def ReProcessMissedTiles(self):
     #     try:
@@ -111,47 +248,78 @@ class AssetHandler:
 
     #     self.RetrieveAllAssetIds()
 
+    def ProcessTile(self, x, y, z):
+        """Upload a tile and resolve its asset ID in one fused step.
+
+        Returns (op_id, asset_id) without touching the store on the happy
+        path, so the caller can batch both rows in a single buffer pass. If
+        the retrieval fails after a successful upload, the op ID is still
+        buffered so the paid upload isn't lost.
+        """
+        op_id = None
+        try:
+            op_id = self.upload_func(x, y, z)
+            asset_id = _CachedGetOperation(op_id)
+        except Exception:
+            if op_id is not None:
+                self.write_buffer.Save(x, y, z, op_id, self.op_id_path)
+            raise
+        return op_id, asset_id
+
+    def __ReprocessTile(self, tile, x, y, z, attempt):
+        try:
+            # Start from the upload step
+            op_id, asset_id = self.ProcessTile(x, y, z)
+            self.write_buffer.Save(x, y, z, op_id, self.op_id_path)
+            self.write_buffer.Save(
+                x, y, z, f"rbxassetid://{asset_id}", self.asset_id_path
+            )
+            self.last_errors.pop(tile, None)
+            logging.info("Successfully reprocessed Tile: %s.", tile)
+            return True
+        except Exception as e:
+            error = str(e)
+            if self.last_errors.get(tile) != error:
+                self.last_errors[tile] = error
+                self.write_buffer.Save(x, y, z, error, self.missed_tiles_path)
+            logging.warning("Attempt %d failed for Tile: %s. Error: %s", attempt, tile, e)
+            return False
+
     def ReProcessMissedTiles(self):
         max_retries = 5
 
-        try:
-            with open(self.missed_tiles_path, "r") as f:
-                missed_tiles = json.load(f)
-        except FileNotFoundError:
-            missed_tiles = {}
-        except json.JSONDecodeError:
-            missed_tiles = {}
+        self.FlushWrites()
+
+        missed_tiles = LoadTileJSON(self.missed_tiles_path)
 
         if not missed_tiles:
             return
 
+        # Parse the tile keys once instead of re-splitting on every attempt
+        parsed_tiles = [(tile, *map(int, tile.split("_"))) for tile in missed_tiles]
+        parsed_tiles.sort(key=lambda row: (row[3], row[1], row[2]))
+
         for attempt in range(1, max_retries + 1):
             logging.info(f"Reprocessing attempt {attempt}/{max_retries}...")
 
             reprocessed_tiles = []
 
-            for tile in missed_tiles.keys():
-                tile_parts = tile.split("_")
-                x, y, z = map(int, tile_parts)
-
-                try:
-                    # Start from the upload step
-                    op_id = self.UploadTile(x, y, z)
-                    self.RetrieveAssetIdTile(x, y, z, op_id)
-                    logging.info(f"Successfully reprocessed Tile: {tile}.")
-                    reprocessed_tiles.append(tile)
-                except Exception as e:
-                    logging.warning(
-                        f"Attempt {attempt} failed for Tile: {tile}. Error: {e}"
-                    )
-
-            # Remove successfully reprocessed tiles from missed_tiles
-            for tile in reprocessed_tiles:
-                del missed_tiles[tile]
-
-            # Update missed_tiles file after each attempt
-            with open(self.missed_tiles_path, "w") as f:
-                json.dump(missed_tiles, f, indent=4)
+            futures = {}
+            for tile, x, y, z in parsed_tiles:
+                if tile not in missed_tiles:
+                    continue
+                future = self.pool.submit(self.__ReprocessTile, tile, x, y, z, attempt)
+                futures[future] = tile
+
+            for future in concurrent.futures.as_completed(futures):
+                if future.result():
+                    reprocessed_tiles.append(futures[future])
+
+            # Flush buffered op/asset ID writes once per attempt, then drop
+            # the reprocessed tiles from the missed_tiles file in one batch
+            self.FlushWrites()
+            DeleteTilesFromJSON(reprocessed_tiles, self.missed_tiles_path)
+            missed_tiles = LoadTileJSON(self.missed_tiles_path)
 
             if not missed_tiles:
                 logging.info("All missed tiles successfully reprocessed.")
@@ -159,6 +327,6 @@ class AssetHandler:
 
         # If still tiles are missing after max_retries, raise the custom exception
         if missed_tiles:
-            error_message = f"Failed to reprocess the following tiles after {max_retries} attempts: {list(missed_tiles.keys())}"
+            error_message = f"Failed to reprocess the following tiles after {max_retries} attempts: {list(missed_tiles)}"
             logging.error(error_message)
             raise TileReprocessingError(error_message)
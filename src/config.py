@@ -42,10 +42,26 @@ TILE_VERTEX_LENGTH = 32
 
 os.makedirs(f"output/{ID}")
 
-ROBLOX = OpenCloudClient(ROBLOX_API_KEY, ROBLOX_USER_ID, 15)
-MAPBOX = MapboxClient(MAPBOX_API_KEY, 15)
-SENTINEL = CopernicusTileClient("xoskeleten611@gmail.com", "Yousif$1282005", 15)
-AIRPORTS = airportsdata.load()
+# Heavy globals (API clients, the multi-MB airports database) are created
+# lazily on first attribute access (PEP 562), so importing config stays
+# cheap. Access them as config.ROBLOX etc.
+_LAZY_GLOBALS = {
+    "ROBLOX": lambda: OpenCloudClient(ROBLOX_API_KEY, ROBLOX_USER_ID, 15),
+    "MAPBOX": lambda: MapboxClient(MAPBOX_API_KEY, 15),
+    "SENTINEL": lambda: CopernicusTileClient(
+        "xoskeleten611@gmail.com", "Yousif$1282005", 15
+    ),
+    "AIRPORTS": lambda: airportsdata.load(),
+}
+
+
+def __getattr__(name):
+    factory = _LAZY_GLOBALS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = factory()
+    globals()[name] = value
+    return value
 
 
 # Logging setup
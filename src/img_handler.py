@@ -1,15 +1,26 @@
 from config import *
+import config
 from img_utils import extend_image_edges
 from rbx_open_cloud import AssetType, ContentType
 from mapbox import *
+import os
+import threading
+
+
+def _ThreadImgPath():
+    # Each pool worker gets its own temp image path so parallel uploads
+    # don't overwrite each other's downloads mid-flight
+    root, ext = os.path.splitext(SAVED_IMG_PATH)
+    return f"{root}_{threading.get_ident()}{ext}"
 
 
 def UploadTileImg(x, y, z):
-    MAPBOX.GetImageTile(MapboxAPI.Tilesets.SATELLITE, x, y, z, ".jpg", SAVED_IMG_PATH)
-    # SENTINEL.get_image_tile(x, y, z, SAVED_IMG_PATH)
-    extend_image_edges(SAVED_IMG_PATH, 16)
-    op_id = ROBLOX.CreateAsset(
-        SAVED_IMG_PATH,
+    img_path = _ThreadImgPath()
+    config.MAPBOX.GetImageTile(MapboxAPI.Tilesets.SATELLITE, x, y, z, ".jpg", img_path)
+    # config.SENTINEL.get_image_tile(x, y, z, img_path)
+    extend_image_edges(img_path, 16)
+    op_id = config.ROBLOX.CreateAsset(
+        img_path,
         AssetType.IMAGE,
         ContentType.JPEG,
         display_name=f"TILE_{x}_{y}_{z}",
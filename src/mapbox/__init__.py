@@ -1,7 +1,8 @@
 from mapbox.mapbox_constants import *
 import requests
+import shutil
+from requests.adapters import HTTPAdapter
 from PIL import Image
-from io import BytesIO
 
 
 class GetImageTileFailedException(Exception):
@@ -14,6 +15,48 @@ class MapboxClient:
         self.api_key = api_key
         self.max_retries = max_retries
 
+        # Persistent session with a pooled adapter: keep-alive skips a
+        # fresh TCP + TLS handshake per tile
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Decoded parent DEM tiles for the z > 14 crop path. Sibling tiles
+        # crop out of the same zoom-14 parent, so caching the decoded image
+        # skips both the re-download and the PNG decode for up to
+        # scale_factor^2 - 1 of every scale_factor^2 tiles
+        self._parent_tiles: dict = {}
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _CropParentTile(self, base_tile, x, y, scale_factor, output_path):
+        # Calculate crop size
+        tile_size = 512  # Size of a Mapbox tile
+        crop_size = tile_size // scale_factor
+
+        # Calculate crop position for the x, y of the requested zoom level
+        crop_x = (x % scale_factor) * crop_size
+        crop_y = (y % scale_factor) * crop_size
+        cropped_tile = base_tile.crop(
+            (crop_x, crop_y, crop_x + crop_size, crop_y + crop_size)
+        )
+
+        # Resize cropped tile to standard tile size. Nearest keeps the
+        # encoded DEM values exact — bicubic would blend the packed RGB
+        # height encoding across pixels and invent bogus heights
+        resized_tile = cropped_tile.resize((tile_size, tile_size), Image.NEAREST)
+        # Fast compression: the file is re-read immediately and deleted
+        # with the run, so spending CPU on a small PNG is wasted
+        resized_tile.save(output_path, compress_level=1)
+
     def GetImageTile(self, tileset_id, x, y, z, file_format, output_path):
         if tileset_id == MapboxAPI.Tilesets.TERRAIN_DEM and z > 14:
             requested_zoom = 14
@@ -26,6 +69,14 @@ class MapboxClient:
             requested_x = x
             requested_y = y
 
+        if scale_factor > 1:
+            base_tile = self._parent_tiles.get(
+                (tileset_id, requested_zoom, requested_x, requested_y)
+            )
+            if base_tile is not None:
+                self._CropParentTile(base_tile, x, y, scale_factor, output_path)
+                return
+
         url = MapboxAPI.RASTER_API.format(
             tileset_id,
             requested_zoom,
@@ -36,32 +87,33 @@ class MapboxClient:
         )
 
         for i in range(self.max_retries):
-            response = requests.get(url)
+            response = self.session.get(url, stream=True)
 
             if response.status_code // 100 == 2:
                 # Save the map tile to file
                 if scale_factor == 1:
+                    # Stream straight to disk instead of buffering the whole
+                    # tile in response.content first
+                    response.raw.decode_content = True
                     with open(output_path, "wb") as f:
-                        f.write(response.content)
-                        f.close()
-                        return
+                        shutil.copyfileobj(response.raw, f, length=1 << 16)
+                    return
                 else:
-                    base_tile = Image.open(BytesIO(response.content))
-
-                    # Calculate crop size
-                    tile_size = 512  # Size of a Mapbox tile
-                    crop_size = tile_size // scale_factor
-
-                    # Calculate crop position for the x, y of the requested zoom level
-                    crop_x = (x % scale_factor) * crop_size
-                    crop_y = (y % scale_factor) * crop_size
-                    cropped_tile = base_tile.crop(
-                        (crop_x, crop_y, crop_x + crop_size, crop_y + crop_size)
-                    )
-
-                    # Resize cropped tile to standard tile size
-                    resized_tile = cropped_tile.resize((tile_size, tile_size))
-                    resized_tile.save(output_path)
+                    # Decode straight off the socket stream too — no
+                    # response.content buffer of the full PNG first
+                    response.raw.decode_content = True
+                    base_tile = Image.open(response.raw)
+                    base_tile.load()
+
+                    # Cache the decoded parent, evicting the oldest entry
+                    # (a 512x512 RGB tile is under 1 MB, so 16 is cheap)
+                    if len(self._parent_tiles) >= 16:
+                        self._parent_tiles.pop(next(iter(self._parent_tiles)))
+                    self._parent_tiles[
+                        (tileset_id, requested_zoom, requested_x, requested_y)
+                    ] = base_tile
+
+                    self._CropParentTile(base_tile, x, y, scale_factor, output_path)
                     return
 
             elif (
@@ -1,64 +1,121 @@
 from config import *
+import config
 from rbx_open_cloud import AssetType, ContentType
 from mapbox import *
-import argparse, subprocess
+from asset_handler import SaveTileToJSON
+import threading
 import bpy
 from PIL import Image
 import numpy as np
-from scipy.ndimage import zoom
-import matplotlib.pyplot as plt
-import json
 import math
-import mercantile
 
 bpy.app.binary_path = BLENDER_PATH
 
+# Batch export never needs undo; skipping the per-operator undo push saves
+# a full scene snapshot on every tile
+bpy.context.preferences.edit.use_global_undo = False
+
+# bpy keeps global state and is not thread safe, and each build goes
+# through the shared heightmap/mesh temp files — one mesh tile at a time
+_bpy_lock = threading.Lock()
 
-def UploadTileMesh(x, y, z):
-    MAPBOX.GetImageTile(
-        MapboxAPI.Tilesets.TERRAIN_DEM, x, y, z, ".pngraw", SAVED_HEIGHTMAP_PATH
-    )
-    GetHeightmappedMesh(x, y, z, SAVED_HEIGHTMAP_PATH, SAVED_MESH_PATH, True)
-    op_id = ROBLOX.CreateAsset(
-        SAVED_MESH_PATH,
-        AssetType.MESH,
-        ContentType.FBX,
-        display_name=f"TILE_{x}_{y}_{z}",
-    )
+
+def _UploadMesh(x, y, z, spherical):
+    with _bpy_lock:
+        config.MAPBOX.GetImageTile(
+            MapboxAPI.Tilesets.TERRAIN_DEM, x, y, z, ".pngraw", SAVED_HEIGHTMAP_PATH
+        )
+        GetHeightmappedMesh(x, y, z, SAVED_HEIGHTMAP_PATH, SAVED_MESH_PATH, spherical)
+        op_id = config.ROBLOX.CreateAsset(
+            SAVED_MESH_PATH,
+            AssetType.MESH,
+            ContentType.FBX,
+            display_name=f"TILE_{x}_{y}_{z}",
+        )
 
     return op_id
 
 
+def UploadTileMesh(x, y, z):
+    return _UploadMesh(x, y, z, True)
+
+
 def UploadFlatTileMesh(x, y, z):
-    MAPBOX.GetImageTile(
-        MapboxAPI.Tilesets.TERRAIN_DEM, x, y, z, ".pngraw", SAVED_HEIGHTMAP_PATH
-    )
-    GetHeightmappedMesh(x, y, z, SAVED_HEIGHTMAP_PATH, SAVED_MESH_PATH, False)
-    op_id = ROBLOX.CreateAsset(
-        SAVED_MESH_PATH,
-        AssetType.MESH,
-        ContentType.FBX,
-        display_name=f"TILE_{x}_{y}_{z}",
-    )
+    op_id = _UploadMesh(x, y, z, False)
 
     print(op_id)
 
     return op_id
 
 
-def SaveTileToJSON(x, y, z, value, output_file):
-    try:
-        with open(output_file, "r") as f:
-            keys = json.load(f)
-    except FileNotFoundError:
-        keys = {}
-    except json.JSONDecodeError:
-        keys = {}
+# Vertex buffer of the pristine tile template, captured on first load so
+# subsequent tiles can restore it instead of re-opening the .blend
+_template_coords = None
+
+
+def _LoadTileTemplate():
+    """Return the tile object, opening the template .blend only once.
+
+    The first call deserializes the scene and snapshots the original vertex
+    buffer; later calls just restore that buffer and reset the object
+    location (origin_set moves it during export prep)."""
+    global _template_coords
 
-    keys[f"{x}_{y}_{z}"] = value
+    if _template_coords is None:
+        bpy.ops.wm.open_mainfile(filepath=BLENDER_TILE_PATH)
+        tile = bpy.context.scene.objects[0]
+        _template_coords = np.empty(len(tile.data.vertices) * 3, dtype=np.float32)
+        tile.data.vertices.foreach_get("co", _template_coords)
+    else:
+        tile = bpy.context.scene.objects[0]
+        tile.data.vertices.foreach_set("co", _template_coords)
+        tile.data.update()
+        tile.location = (0.0, 0.0, 0.0)
 
-    with open(output_file, "w") as f:
-        json.dump(keys, f, indent=4)
+    return tile
+
+
+# Per-vertex heightmap sample indices/weights, keyed by heightmap shape.
+# They depend only on the template geometry and the map size, so they're
+# identical for every tile
+_sample_tables: dict = {}
+
+
+def _GetSampleTable(src_h, src_w):
+    table = _sample_tables.get((src_h, src_w))
+    if table is None:
+        verts = _template_coords.reshape(-1, 3)
+        sample_rows = (1.0 - verts[:, 1]) * (src_h - 1)
+        sample_cols = verts[:, 0] * (src_w - 1)
+
+        r0 = np.clip(np.floor(sample_rows).astype(np.intp), 0, src_h - 1)
+        c0 = np.clip(np.floor(sample_cols).astype(np.intp), 0, src_w - 1)
+        fr = (sample_rows - r0).astype(np.float32)
+        fc = (sample_cols - c0).astype(np.float32)
+        r1 = np.minimum(r0 + 1, src_h - 1)
+        c1 = np.minimum(c0 + 1, src_w - 1)
+
+        table = (r0, c0, r1, c1, fr, fc)
+        _sample_tables[(src_h, src_w)] = table
+    return table
+
+
+# Reusable float32 work buffers, sized once since the template geometry is
+# fixed — avoids reallocating per tile
+_scratch: dict = {}
+
+
+def _GetScratch(num_verts):
+    scratch = _scratch.get(num_verts)
+    if scratch is None:
+        scratch = {
+            "out": np.empty((num_verts, 3), dtype=np.float32),
+            "lon_rad": np.empty(num_verts, dtype=np.float32),
+            "lat_rad": np.empty(num_verts, dtype=np.float32),
+            "r": np.empty(num_verts, dtype=np.float32),
+        }
+        _scratch[num_verts] = scratch
+    return scratch
 
 
 # Function to convert Mercator x, y to spherical coordinates
@@ -71,67 +128,85 @@ def mercator_to_sphere(latitude, longitude, radius):
 
 
 def GetHeightmappedMesh(x, y, z, heightmap_path, output_path, spherical):
-    bpy.ops.wm.open_mainfile(filepath=BLENDER_TILE_PATH)
-    tile = bpy.context.scene.objects[0]
+    tile = _LoadTileTemplate()
 
     with Image.open(heightmap_path) as img:
-        img = img.convert("RGB")
-        img_array = np.array(img, dtype=np.int32)
-
-        # RGB to height conversion
-        coeff = np.array([256 * 256, 256, 1], dtype=np.float32)
-        height_map_2d = -10000 + (np.tensordot(img_array, coeff, axes=([2], [0])) * 0.1)
-        height_map_2d = np.clip(height_map_2d, a_min=0, a_max=None)
-
-        # Resize height_map_2d to 32x32 to match mesh vertices
-        resized_height_map = zoom(
-            height_map_2d,
-            (
-                TILE_VERTEX_LENGTH / height_map_2d.shape[0],
-                TILE_VERTEX_LENGTH / height_map_2d.shape[1],
-            ),
-        )
+        # Mapbox .pngraw tiles are already 3-channel 8-bit, so the usual
+        # case decodes straight into the array with no convert copy
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img_array = np.asarray(img, dtype=np.uint8)
+
+        # RGB to height conversion, fused into one uint8 -> float32 pass:
+        # height = -10000 + (65536*R + 256*G + B) * 0.1. Folding the 0.1
+        # into the coefficients skips the int32 temporary tensordot needed.
+        coeff = np.array([256 * 256 * 0.1, 256 * 0.1, 0.1], dtype=np.float32)
+        height_map_2d = np.einsum("hwc,c->hw", img_array, coeff, optimize=True)
+        height_map_2d -= 10000
+        np.maximum(height_map_2d, 0, out=height_map_2d)
 
         mesh = tile.data
-        # max_height = 0
-
-        # Apply heights to mesh vertices
-        for i, vertex in enumerate(mesh.vertices):
-            # get pixel idx
-            x_idx = int(np.round(vertex.co.x * (TILE_VERTEX_LENGTH - 1)))
-            y_idx = int(np.round((1 - vertex.co.y) * (TILE_VERTEX_LENGTH - 1)))
-
-            # get height value
-            height = resized_height_map[y_idx, x_idx]
-
-            if spherical:
-                # get longitude
-                n = 1 << z
-                lon_deg = (x + vertex.co.x) / n * 360.0 - 180.0
-
-                # get latitude
-                lat_rad = math.atan(
-                    math.sinh(math.pi * (1 - 2 * (y + 1 - vertex.co.y) / n))
-                )
-                lat_deg = math.degrees(lat_rad)
-
-                r = 6378137
-                if vertex.co.z > 0:
-                    r += height
-
-                # get spherical
-                x_s, y_s, z_s = mercator_to_sphere(
-                    lat_deg, lon_deg, r * 0.0001 * 0.01  # small scale + 0.01 fbx units
-                )
-
-                # assign position
-                vertex.co.x = x_s
-                vertex.co.y = y_s
-                vertex.co.z = z_s
-            else:
-                vertex.co.z = height / (40075000 / 2**z)
-
-            # max_height = max(max_height, height)
+
+        # The template was just restored, so its pristine coords are already
+        # in _template_coords — no foreach_get roundtrip needed
+        verts = _template_coords.reshape(-1, 3)
+        num_verts = len(verts)
+
+        # Sample the full-resolution heightmap directly at each vertex UV
+        # with a 4-tap bilinear gather, instead of scipy-zooming the whole
+        # map down to 32x32 and doing a nearest pixel lookup per vertex.
+        # Indices and weights are precomputed per heightmap size.
+        src_h, src_w = height_map_2d.shape
+        r0, c0, r1, c1, fr, fc = _GetSampleTable(src_h, src_w)
+
+        sampled_heights = (
+            (1 - fr) * (1 - fc) * height_map_2d[r0, c0]
+            + (1 - fr) * fc * height_map_2d[r0, c1]
+            + fr * (1 - fc) * height_map_2d[r1, c0]
+            + fr * fc * height_map_2d[r1, c1]
+        )
+
+        # Work buffers come from the per-process scratch pool: every ufunc
+        # writes in place, and foreach_set gets a C-contiguous buffer
+        scratch = _GetScratch(num_verts)
+        out = scratch["out"]
+
+        if spherical:
+            n = 1 << z
+
+            # longitude in radians: ((x + vx) / n) * 2pi - pi
+            lon_rad = scratch["lon_rad"]
+            np.add(verts[:, 0], x, out=lon_rad)
+            lon_rad *= 2.0 * np.pi / n
+            lon_rad -= np.pi
+
+            # latitude: arctan(sinh(pi * (1 - 2 * (y + 1 - vy) / n)))
+            lat_rad = scratch["lat_rad"]
+            np.subtract(1.0 + y, verts[:, 1], out=lat_rad)
+            lat_rad *= -2.0 * np.pi / n
+            lat_rad += np.pi
+            np.sinh(lat_rad, out=lat_rad)
+            np.arctan(lat_rad, out=lat_rad)
+
+            # only the top surface picks up the sampled height
+            top = verts[:, 2] > 0
+            r = scratch["r"]
+            r.fill(6378137.0)
+            r[top] += sampled_heights[top]
+            r *= 0.0001 * 0.01  # small scale + 0.01 fbx units
+
+            cos_lat = np.cos(lat_rad)
+            cos_lat *= r  # r * cos(lat)
+            np.multiply(np.cos(lon_rad), cos_lat, out=out[:, 0])
+            np.multiply(np.sin(lon_rad), cos_lat, out=out[:, 1])
+            np.sin(lat_rad, out=out[:, 2])
+            out[:, 2] *= r
+        else:
+            out[:] = verts
+            np.divide(sampled_heights, 40075000 / 2**z, out=out[:, 2])
+
+        mesh.vertices.foreach_set("co", out.reshape(-1))
+        mesh.update()
 
     bpy.ops.object.origin_set(type="ORIGIN_GEOMETRY", center="BOUNDS")
 
@@ -143,7 +218,15 @@ def GetHeightmappedMesh(x, y, z, heightmap_path, output_path, spherical):
         MESH_VERT_OFFSET_PATH,
     )
 
-    bpy.ops.export_scene.fbx(filepath=output_path)
+    # Export just the mesh: no modifiers evaluation, animation baking or
+    # armature leaf bones, which are the expensive parts of the operator
+    bpy.ops.export_scene.fbx(
+        filepath=output_path,
+        object_types={"MESH"},
+        use_mesh_modifiers=False,
+        bake_anim=False,
+        add_leaf_bones=False,
+    )
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 from rbx_open_cloud.open_cloud_constants import *
-import json
+import orjson
+import os
 import time
+import random
 import logging
 
 
@@ -21,6 +25,51 @@ class OpenCloudClient:
         self.user_id = user_id
         self.max_retries = max_retries
 
+        # One persistent session so uploads and operation polls reuse
+        # pooled keep-alive connections instead of re-handshaking TLS
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("https://", adapter)
+        # The key is the same for every call, so set it once on the session
+        # instead of rebuilding a headers dict per request
+        self.session.headers["x-api-key"] = api_key
+
+        # The creation context is identical for every asset this client
+        # makes, so build the nested dict once instead of per upload
+        self._creation_context = {
+            "creator": {
+                "userId": user_id,
+            }
+        }
+
+    def _RetryWait(self, response, attempt):
+        """Sleep before retrying a rate-limited request.
+
+        Honors the server's Retry-After header when present, otherwise falls
+        back to capped exponential backoff with jitter so parallel workers
+        don't retry in lockstep."""
+        wait = None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                wait = float(retry_after)
+            except ValueError:
+                pass
+        if wait is None:
+            wait = min(60.0, 2.0**attempt + random.uniform(0.0, 1.0))
+
+        logging.warning(f"Rate limited. Trying again in {wait:.1f} seconds.")
+        time.sleep(wait)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def CreateAsset(
         self,
         file_path: str,
@@ -30,66 +79,79 @@ class OpenCloudClient:
         description: str = "",
     ) -> str | None:
         """Send a 'Create Asset' POST Request. Returns the Operation ID."""
-        headers = {
-            "x-api-key": self.api_key,
-        }
-
         data = {
-            "request": json.dumps(
+            "request": orjson.dumps(
                 {
                     "assetType": asset_type,
                     "displayName": display_name,
                     "description": description,
-                    "creationContext": {
-                        "creator": {
-                            "userId": self.user_id,
-                        }
-                    },
+                    "creationContext": self._creation_context,
                 }
             )
         }
 
-        files = {"fileContent": (file_path, open(file_path, "rb"), content_type)}
-
-        for i in range(self.max_retries):
-            response = requests.post(
-                OpenCloudAPI.ASSETS,
-                headers=headers,
-                data=data,
-                files=files,
-            )
+        attempt = 0
+        rate_limited = 0
+        while attempt < self.max_retries:
+            # Stream the multipart body straight from disk into the socket
+            # instead of letting requests buffer the whole file in memory.
+            # Rebuilt per attempt: a consumed stream can't be re-sent
+            with open(file_path, "rb") as file_content:
+                encoder = MultipartEncoder(
+                    fields={
+                        "request": data["request"],
+                        "fileContent": (
+                            os.path.basename(file_path),
+                            file_content,
+                            content_type,
+                        ),
+                    }
+                )
+                response = self.session.post(
+                    OpenCloudAPI.ASSETS,
+                    data=encoder,
+                    headers={"Content-Type": encoder.content_type},
+                )
 
             if response.ok:
-                return json.loads(response.text)["operationId"]
+                return orjson.loads(response.content)["operationId"]
             elif (
                 response.status_code == V1ErrorCodes.RESOURCE_EXHAUSTED
                 or response.status_code == 0
             ):
-                logging.warning(
-                    "Exhausted Rate Limit for Create Asset. Trying again in 60 seconds"
-                )
-                # Avoid hitting the rate limit if exhausted, or wait extra time if no response recieved
-                time.sleep(60)
-                # Try one more time
-                i -= 1
+                # Being rate limited doesn't consume a retry, it just backs
+                # off further each time
+                self._RetryWait(response, rate_limited)
+                rate_limited += 1
+            else:
+                attempt += 1
 
         raise CreateAssetFailedException(file_path, response.text)
 
-    def GetOperation(self, operationId: str) -> str | None:
-        headers = {
-            "x-api-key": self.api_key,
-        }
-
-        for i in range(self.max_retries):
-            response = requests.get(
+    def GetOperation(
+        self,
+        operationId: str,
+        deadline: float = 120.0,
+        initial: float = 0.25,
+        cap: float = 4.0,
+    ) -> str | None:
+        """Poll an operation until it completes or `deadline` seconds pass.
+
+        Polls quickly at first (`initial`) and backs off exponentially up to
+        `cap` seconds between polls, so fast operations return in well under
+        a second while slow ones don't hammer the API."""
+        start = time.monotonic()
+        attempt = 0
+        rate_limited = 0
+        while time.monotonic() - start <= deadline:
+            response = self.session.get(
                 OpenCloudAPI.OPERATIONS + f"/{operationId}",
-                headers=headers,
             )
 
             if response.ok:
-                data = json.loads(response.text)
+                data = orjson.loads(response.content)
 
-                if "error" in data.keys():
+                if "error" in data:
                     raise OperationFailedException(operationId, data["error"])
 
                 if data["done"]:
@@ -98,15 +160,15 @@ class OpenCloudClient:
                 response.status_code == V1ErrorCodes.RESOURCE_EXHAUSTED
                 or response.status_code == 0
             ):
-                logging.warning(
-                    "Exhausted Rate Limit for Get Operation. Trying again in 60 seconds."
-                )
-                # Avoid hitting the rate limit if exhausted, or wait extra time if no response recieved
-                time.sleep(60)
-                # Try one more time
-                i -= 1
-
-            # extra timeout between retries
-            time.sleep(i)
+                # Rate limiting waits out the server's window instead of the
+                # poll backoff
+                self._RetryWait(response, rate_limited)
+                rate_limited += 1
+                continue
+
+            # capped exponential backoff between polls, jittered so pooled
+            # workers don't poll in lockstep
+            time.sleep(min(cap, initial * 2**attempt) + random.uniform(0.0, 0.25))
+            attempt += 1
 
         raise OperationFailedException(operationId, response.text)
@@ -1,3 +1,4 @@
+import functools
 import os
 import rasterio
 import numpy as np
@@ -5,10 +6,25 @@ import pyproj
 from sentinelsat import SentinelAPI
 from rasterio.windows import Window
 from rasterio.transform import from_origin
-from rasterio.warp import calculate_default_transform, reproject, Resampling
+from rasterio.warp import (
+    calculate_default_transform,
+    reproject,
+    transform_bounds,
+    Resampling,
+)
 from typing import Tuple, List
 
 
+@functools.lru_cache(maxsize=4)
+def _open_product(path: str):
+    """Cached rasterio dataset per downloaded product.
+
+    Neighbouring tiles usually resolve to the same Sentinel product, and
+    reopening it pays the full dataset-open and JPEG2000 header parse every
+    time; the cache keeps the handful of recent products live instead."""
+    return rasterio.open(path)
+
+
 class GetImageTileFailedException(Exception):
     def __init__(self, x: int, y: int, z: int, message: str = None) -> None:
         error_msg = f"Failed to get image tile at: X:{x} Y:{y} ZOOM:{z}"
@@ -62,13 +78,16 @@ class CopernicusTileClient:
         :param bands: Optional list of bands to extract (e.g., ['B04', 'B03', 'B02'])
         :return: Path to saved tile image
         """
-        # Calculate geographic bounds for the tile
-        lon_min, lat_min = self._tile_to_lonlat(x, y, z)
-        lon_max, lat_max = self._tile_to_lonlat(x + 1, y + 1, z)
+        # Calculate geographic bounds for the tile, both corners at once
+        lons, lats = self._tiles_to_lonlat(
+            np.array([x, x + 1]), np.array([y, y + 1]), z
+        )
+        (lon_min, lon_max), (lat_min, lat_max) = lons, lats
 
-        # Transform bounds to Web Mercator
-        merc_min_x, merc_min_y = self.transformer.transform(lon_min, lat_min)
-        merc_max_x, merc_max_y = self.transformer.transform(lon_max, lat_max)
+        # Transform bounds to Web Mercator in one array call — pyproj's
+        # array path is far cheaper than per-point scalar calls
+        merc_xs, merc_ys = self.transformer.transform(lons, lats)
+        (merc_min_x, merc_max_x), (merc_min_y, merc_max_y) = merc_xs, merc_ys
 
         # Create a bounding box for search
         footprint = f"POLYGON(({lon_min} {lat_min},{lon_max} {lat_min},{lon_max} {lat_max},{lon_min} {lat_max},{lon_min} {lat_min}))"
@@ -96,36 +115,64 @@ class CopernicusTileClient:
         )
         downloaded_file = download_path["path"]
 
-        # Open the downloaded product
-        with rasterio.open(downloaded_file) as src:
-            bands = ["B04", "B03", "B02"]  # Red, Green, Blue
-
-            # Extract specified bands
-            band_indices = [src.descriptions.index(band) + 1 for band in bands]
-
-            # Read the bands
-            tile_data = src.read(band_indices)
-
-            # Calculate transform for Web Mercator tile
-            transform = rasterio.transform.from_bounds(
-                merc_min_x, merc_min_y, merc_max_x, merc_max_y, width=512, height=512
-            )
-
-            # Prepare output profile for Web Mercator
-            profile = {
-                "driver": "GTiff",
-                "height": 512,
-                "width": 512,
-                "count": len(bands),
-                "dtype": tile_data.dtype,
-                "crs": self.web_mercator.to_wkt(),
-                "transform": transform,
-                "compress": "lzw",
-            }
-
-            # Write the tile in Web Mercator
-            with rasterio.open(output_path, "w", **profile) as dst:
-                dst.write(tile_data)
+        # Open the downloaded product through the dataset cache
+        src = _open_product(downloaded_file)
+
+        bands = ["B04", "B03", "B02"]  # Red, Green, Blue
+
+        # Extract specified bands
+        band_indices = [src.descriptions.index(band) + 1 for band in bands]
+
+        # Read only the source window covering this tile instead of decoding
+        # the whole product — JP2K is internally tiled, so untouched blocks
+        # are never decompressed
+        src_bounds = transform_bounds(
+            self.web_mercator,
+            src.crs,
+            merc_min_x,
+            merc_min_y,
+            merc_max_x,
+            merc_max_y,
+        )
+        window = src.window(*src_bounds)
+        tile_data = src.read(band_indices, window=window)
+
+        # Calculate transform for Web Mercator tile
+        transform = rasterio.transform.from_bounds(
+            merc_min_x, merc_min_y, merc_max_x, merc_max_y, width=512, height=512
+        )
+
+        # Warp the source bands onto the Web Mercator tile grid. All
+        # three bands go through one multiband reproject call, and the
+        # interpolation kernel fans out across cores
+        tile_grid_data = np.empty((len(bands), 512, 512), dtype=tile_data.dtype)
+        reproject(
+            source=tile_data,
+            destination=tile_grid_data,
+            src_transform=src.window_transform(window),
+            src_crs=src.crs,
+            dst_transform=transform,
+            dst_crs=self.web_mercator,
+            resampling=Resampling.bilinear,
+            num_threads=os.cpu_count(),
+            warp_mem_limit=512,
+        )
+
+        # Prepare output profile for Web Mercator
+        profile = {
+            "driver": "GTiff",
+            "height": 512,
+            "width": 512,
+            "count": len(bands),
+            "dtype": tile_data.dtype,
+            "crs": self.web_mercator.to_wkt(),
+            "transform": transform,
+            "compress": "lzw",
+        }
+
+        # Write the tile in Web Mercator
+        with rasterio.open(output_path, "w", **profile) as dst:
+            dst.write(tile_grid_data)
 
         return output_path
 
@@ -142,3 +189,22 @@ class CopernicusTileClient:
         lon_deg = x / n * 360.0 - 180.0
         lat_deg = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y / n))))
         return lon_deg, lat_deg
+
+    def _tiles_to_lonlat(
+        self, xs: np.ndarray, ys: np.ndarray, z: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert arrays of XYZ tile coordinates to Longitude/Latitude arrays
+
+        Vectorized counterpart of _tile_to_lonlat: one C-level ufunc pass
+        over the whole batch instead of per-tile NumPy scalar calls
+
+        :param xs: Tile X coordinates
+        :param ys: Tile Y coordinates
+        :param z: Zoom level
+        :return: (longitudes, latitudes)
+        """
+        n = 2.0**z
+        lon_deg = xs / n * 360.0 - 180.0
+        lat_deg = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * ys / n))))
+        return lon_deg, lat_deg
@@ -5,24 +5,53 @@ import logging
 from img_utils import *
 from tile_quadtree import *
 from config import *
-from asset_handler import AssetHandler, TileReprocessingError
+import config
+from asset_handler import AssetHandler, TileReprocessingError, LoadTileJSON
 from img_handler import UploadTileImg
 from mesh_handler import UploadTileMesh, UploadFlatTileMesh
 import argparse
+import concurrent.futures
 
 
-def recurseProcessTile(tile: Tile, asset_handler: AssetHandler):
-    if tile.is_leaf:
-        asset_handler.UploadTile(tile.x, tile.y, tile.zoom)
+def collectLeafTiles(root: Tile):
+    """Pure traversal — gather leaf (x, y, zoom) tuples with no I/O."""
+    leaves = []
+    stack = [root]
 
-    for child in tile.children:
-        recurseProcessTile(child, asset_handler)
+    # Explicit stack instead of recursion: no per-node Python frame setup
+    # and no recursion-limit concerns at high MAX_LOD
+    while stack:
+        tile = stack.pop()
+        if tile.is_leaf:
+            leaves.append((tile.x, tile.y, tile.zoom))
+        stack.extend(tile.children)
+
+    return leaves
+
+
+def processTiles(tiles, asset_handler: AssetHandler):
+    # Dispatch the collected tiles over the handler's pool so the blocking
+    # HTTPS calls overlap. Threads rather than processes: the work is
+    # network-bound, and the mesh path drives bpy in-process, which can't be
+    # forked into pool workers.
+    # One upfront load of the already-uploaded tile keys instead of a
+    # per-tile existence check
+    existing = set(LoadTileJSON(asset_handler.op_id_path))
+
+    futures = [
+        asset_handler.pool.submit(asset_handler.UploadTile, x, y, z)
+        for x, y, z in tiles
+        if f"{x}_{y}_{z}" not in existing
+    ]
+    concurrent.futures.wait(futures)
 
 
 def main(args):
     quadtree = QuadTree(QUADTREE_ROOT, QUADTREE_MAX_LOD, QUADTREE_LOD_THRESHOLD)
     for airport in QUADTREE_AIRPORTS:
-        quadtree.AddPoint(AIRPORTS[airport]["lat"], AIRPORTS[airport]["lon"])
+        quadtree.AddPoint(
+            config.AIRPORTS[airport]["lat"], config.AIRPORTS[airport]["lon"]
+        )
     quadtree.BuildTree()
 
     img = AssetHandler(
@@ -32,16 +61,18 @@ def main(args):
         MESH_ASSET_ID_PATH, MESH_OPERATIONS_PATH, MISSED_MESH_PATH, UploadTileMesh
     )
 
+    leaves = collectLeafTiles(quadtree.root)
+
     if args.asset == "all":
         try:
-            recurseProcessTile(quadtree.root, img)
+            processTiles(leaves, img)
             img.RetrieveAllAssetIds()
             img.ReProcessMissedTiles()
         except TileReprocessingError as e:
             print(e)
 
         try:
-            recurseProcessTile(quadtree.root, mesh)
+            processTiles(leaves, mesh)
             mesh.RetrieveAllAssetIds()
             mesh.ReProcessMissedTiles()
         except TileReprocessingError as e:
@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 
 def deg2num(lat_deg, lon_deg, zoom):
     lat_rad = math.radians(lat_deg)
@@ -18,12 +20,18 @@ def num2deg(xtile, ytile, zoom):
 
 
 class GpsPoint:
+    __slots__ = ("latitude", "longitude")
+
     def __init__(self, latitude, longitude) -> None:
         self.latitude = latitude
         self.longitude = longitude
 
 
 class Tile:
+    # One Tile per quadtree node — slots drop the per-instance __dict__,
+    # which is most of the memory for deep trees
+    __slots__ = ("x", "y", "zoom", "children", "is_leaf")
+
     def __init__(self, x, y, zoom) -> None:
         self.x = x
         self.y = y
@@ -38,43 +46,67 @@ class QuadTree:
         self.max_lod = max_lod
         self.lod_subdivide_threshold = lod_subdivide_threshold
         self.gps_points: list[GpsPoint] = []
+        # Vectorized copies of the GPS points for the proximity test
+        self._point_lat_rads = np.empty(0)
+        self._point_lons = np.empty(0)
+        # Per-zoom projected point tile coords, filled in by BuildTree
+        self._point_tiles: dict = {}
 
     def AddPoint(self, lat, lon):
         self.gps_points.append(GpsPoint(lat, lon))
+        self._point_lat_rads = np.radians([p.latitude for p in self.gps_points])
+        self._point_lons = np.array([p.longitude for p in self.gps_points])
 
     def __subdivide(self, tile: Tile):
-        for point in self.gps_points:
-            point_tile_x, point_tile_y = deg2num(
-                point.latitude, point.longitude, tile.zoom
-            )
+        if len(self._point_lons) == 0:
+            return
 
-            if (
-                abs(point_tile_x - tile.x) <= 1 and abs(point_tile_y - tile.y) <= 1
-            ) or tile.zoom >= self.lod_subdivide_threshold:
-                # Subdivide
-                top_left = Tile(tile.x * 2, tile.y * 2, tile.zoom + 1)
-                top_right = Tile(tile.x * 2 + 1, tile.y * 2, tile.zoom + 1)
-                bottom_left = Tile(tile.x * 2, tile.y * 2 + 1, tile.zoom + 1)
-                bottom_right = Tile(tile.x * 2 + 1, tile.y * 2 + 1, tile.zoom + 1)
-
-                tile.children = [
-                    top_left,
-                    top_right,
-                    bottom_left,
-                    bottom_right,
-                ]
-
-                tile.is_leaf = False
+        if tile.zoom < self.lod_subdivide_threshold:
+            point_tile_x, point_tile_y = self._point_tiles[tile.zoom]
 
+            near = (np.abs(point_tile_x - tile.x) <= 1) & (
+                np.abs(point_tile_y - tile.y) <= 1
+            )
+            if not near.any():
                 return
 
-    def __buildTreeRecurse(self, tile: Tile):
-        if tile.zoom < self.max_lod:
-            if tile.is_leaf:
-                self.__subdivide(tile)
+        # Subdivide
+        top_left = Tile(tile.x * 2, tile.y * 2, tile.zoom + 1)
+        top_right = Tile(tile.x * 2 + 1, tile.y * 2, tile.zoom + 1)
+        bottom_left = Tile(tile.x * 2, tile.y * 2 + 1, tile.zoom + 1)
+        bottom_right = Tile(tile.x * 2 + 1, tile.y * 2 + 1, tile.zoom + 1)
+
+        tile.children = [
+            top_left,
+            top_right,
+            bottom_left,
+            bottom_right,
+        ]
 
-            for child in tile.children:
-                self.__buildTreeRecurse(child)
+        tile.is_leaf = False
 
     def BuildTree(self):
-        self.__buildTreeRecurse(self.root)
\ No newline at end of file
+        # Project the points once at the finest zoom the walk can visit;
+        # a tile coord at any coarser zoom is an exact right shift of it
+        # (floor(a / 2**k) == floor(a) >> k), so the trig runs exactly once
+        finest = self.max_lod - 1
+        if finest >= self.root.zoom:
+            n = 1 << finest
+            xs = ((self._point_lons + 180.0) / 360.0 * n).astype(np.int64)
+            ys = (
+                (1.0 - np.arcsinh(np.tan(self._point_lat_rads)) / np.pi) / 2.0 * n
+            ).astype(np.int64)
+            for z in range(self.root.zoom, self.max_lod):
+                shift = finest - z
+                self._point_tiles[z] = (xs >> shift, ys >> shift)
+
+        # Explicit stack instead of recursion: no Python frame per node and
+        # no recursion-limit ceiling at high max_lod
+        stack = [self.root]
+        while stack:
+            tile = stack.pop()
+            if tile.zoom < self.max_lod:
+                if tile.is_leaf:
+                    self.__subdivide(tile)
+
+                stack.extend(tile.children)
\ No newline at end of file